@@ -8,6 +8,9 @@ Usage:
     python deploy_site.py              # Deploy to Cloudflare Pages
     python deploy_site.py --no-open    # Deploy without opening browser
     python deploy_site.py --local-only # Generate protected files only, no deploy
+    python deploy_site.py --no-dedupe  # Keep duplicate images in the build
+    python deploy_site.py --no-press   # Don't add press cards for new media CSV rows
+    python deploy_site.py --no-people  # Skip regenerating the team directory
 
 Setup:
     1. Install Wrangler: npm install -g wrangler
@@ -16,22 +19,44 @@ Setup:
        DASHBOARD_PASSWORD=your-password
        CLOUDFLARE_ACCOUNT_ID=your-account-id
        CLOUDFLARE_PROJECT_NAME=rammp-website
+
+Once a deploy confirms the Pages project exists, that is cached in
+.wrangler-state.json and later deploys skip the project check. Delete the
+file to force a re-check.
 """
 
 import os
+import re
 import sys
+import json
+import time
 import shutil
 import hashlib
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR / "scripts"))
+
+from dedupe_images import dedupe_site
+from generate_press import PRESS_PAGE, generate_press
+from generate_people import PEOPLE_PAGE, generate_people
 
 # Files/folders to include in deployment
 INCLUDE_FILES = ['index.html', 'people.html', 'what-is-rammp.html', 'publications.html', 'contact.html', 'progress.html']
 INCLUDE_DIRS = ['assets', 'dist']
 
+# Local cache of verified Cloudflare project/account state
+WRANGLER_STATE_FILE = SCRIPT_DIR / ".wrangler-state.json"
+PAGES_URL_PATTERN = re.compile(r'https://[^\s]+\.pages\.dev')
+CACHED_PROJECT_MESSAGE = "✓ Project verified (cached)"
+# Wrangler output when the Pages project doesn't exist (API error 8000007)
+PROJECT_MISSING_PATTERN = re.compile(
+    r'project not found|not match any of your existing projects|code: 8000007',
+    re.IGNORECASE)
+
 # Password wrapper template - injected into each HTML file
 PASSWORD_WRAPPER = '''<!DOCTYPE html>
 <html lang="en">
@@ -241,98 +266,191 @@ def wrap_site_files(password_hash: str, output_dir: Path):
             print(f"   ✓ {dir_name}/ (copied)")
 
 
+def dedupe_site_images(output_dir: Path):
+    """Collapse byte-identical images in the staged site onto one file each."""
+    print("🧹 Deduplicating images...")
+    summary = dedupe_site(output_dir, apply=True, threshold=0)
+    if summary['removed']:
+        print(f"   Removed {summary['removed']} duplicates "
+              f"({summary['bytes_saved'] / 1024:.1f}KB saved)")
+    else:
+        print("   No duplicates found")
+
+
+def generate_press_section(output_dir: Path):
+    """Add cards for new media CSV articles to the staged press page."""
+    print("📰 Generating press section...")
+    generate_press(output_dir / PRESS_PAGE)
+
+
+def generate_people_section(output_dir: Path):
+    """Render the team directory from the roster into the staged people page."""
+    print("👥 Generating team directory...")
+    generate_people(output_dir / PEOPLE_PAGE, root=output_dir)
+
+
+def find_wrangler() -> str:
+    """Return the path to the Wrangler CLI on PATH, or None if missing."""
+    return shutil.which("wrangler")
+
+
 def check_wrangler_installed() -> bool:
-    """Check if Wrangler CLI is installed."""
+    """Check if Wrangler CLI is installed (PATH lookup, no Node.js startup)."""
+    return find_wrangler() is not None
+
+
+def load_wrangler_state() -> dict:
+    """Load cached Cloudflare project/account state."""
+    try:
+        return json.loads(WRANGLER_STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_wrangler_state(state: dict):
+    """Persist cached Cloudflare project/account state."""
     try:
-        result = subprocess.run(
-            ["wrangler", "--version"],
-            capture_output=True,
-            text=True,
-            shell=True
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
-
-
-def run_wrangler_command(cmd: str, account_id: str) -> tuple:
-    """Run a wrangler command and return (success, stdout, stderr)."""
+        WRANGLER_STATE_FILE.write_text(json.dumps(state, indent=2))
+    except OSError:
+        pass  # Cache is an optimization only
+
+
+def project_state_key(project_name: str, account_id: str) -> str:
+    """Key identifying a Pages project within an account."""
+    return f"{account_id}/{project_name}"
+
+
+def is_project_verified(project_name: str, account_id: str) -> bool:
+    """Check whether a previous run confirmed the Pages project exists."""
+    key = project_state_key(project_name, account_id)
+    return key in load_wrangler_state().get('projects', {})
+
+
+def set_project_verified(project_name: str, account_id: str, verified: bool = True):
+    """Record (or forget) that the Pages project exists."""
+    state = load_wrangler_state()
+    projects = state.setdefault('projects', {})
+    key = project_state_key(project_name, account_id)
+    if verified:
+        projects[key] = {'verified_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    else:
+        projects.pop(key, None)
+    save_wrangler_state(state)
+
+
+def run_wrangler_command(args: list, account_id: str, stream: bool = False,
+                         on_line=None) -> tuple:
+    """Run wrangler with args and return (success, output).
+    
+    stdout and stderr are merged and read line by line as they arrive. With
+    stream=True each line is echoed immediately; on_line is called per line.
+    """
     env = os.environ.copy()
     env['CLOUDFLARE_ACCOUNT_ID'] = account_id
     env['CI'] = 'true'
     
     process = subprocess.Popen(
-        cmd,
-        shell=True,
+        [find_wrangler() or "wrangler", *args],
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         stdin=subprocess.DEVNULL,
         env=env,
         text=False
     )
     
-    stdout_bytes, stderr_bytes = process.communicate()
-    
-    try:
-        stdout = stdout_bytes.decode('utf-8')
-    except UnicodeDecodeError:
-        stdout = stdout_bytes.decode('utf-8', errors='replace')
-    
-    try:
-        stderr = stderr_bytes.decode('utf-8')
-    except UnicodeDecodeError:
-        stderr = stderr_bytes.decode('utf-8', errors='replace')
+    lines = []
+    for raw_line in process.stdout:
+        line = raw_line.decode('utf-8', errors='replace').rstrip()
+        lines.append(line)
+        if stream and line:
+            print(f"   {line}", flush=True)
+        if on_line:
+            on_line(line)
+    process.wait()
     
-    return (process.returncode == 0, stdout, stderr)
+    return (process.returncode == 0, '\n'.join(lines))
 
 
-def create_pages_project(project_name: str, account_id: str) -> bool:
-    """Create a new Cloudflare Pages project."""
-    print(f"   Creating project '{project_name}'...")
-    cmd = f'wrangler pages project create {project_name} --production-branch main'
-    success, stdout, stderr = run_wrangler_command(cmd, account_id)
+def create_pages_project(project_name: str, account_id: str) -> tuple:
+    """Create a new Cloudflare Pages project and return (success, message)."""
+    args = ['pages', 'project', 'create', project_name, '--production-branch', 'main']
+    success, output = run_wrangler_command(args, account_id)
     
     if success:
-        print(f"   ✓ Project created")
-        return True
-    elif "already exists" in stderr.lower() or "already exists" in stdout.lower():
-        print(f"   ✓ Project already exists")
-        return True
+        return (True, "✓ Project created")
+    elif "already exists" in output.lower():
+        return (True, "✓ Project already exists")
     else:
-        print(f"   Failed to create project: {stderr}")
-        return False
+        return (False, f"Failed to create project: {output}")
+
 
+def ensure_pages_project(project_name: str, account_id: str) -> tuple:
+    """Make sure the Pages project exists, skipping wrangler when cached.
+    
+    Safe to run in a background thread: prints nothing and returns
+    (success, message) for the caller to report.
+    """
+    if is_project_verified(project_name, account_id):
+        return (True, CACHED_PROJECT_MESSAGE)
+    
+    success, message = create_pages_project(project_name, account_id)
+    if success:
+        set_project_verified(project_name, account_id)
+    return (success, message)
 
-def deploy_to_cloudflare(source_dir: Path, project_name: str, account_id: str) -> str:
-    """Deploy the wrapped site to Cloudflare Pages."""
+
+def deploy_to_cloudflare(source_dir: Path, project_name: str, account_id: str,
+                         preflight=None) -> str:
+    """Deploy the wrapped site to Cloudflare Pages.
+    
+    preflight is an optional future from ensure_pages_project started
+    earlier so project setup overlaps the site build.
+    """
     print(f"🚀 Deploying to Cloudflare Pages ({project_name})...")
     
-    create_pages_project(project_name, account_id)
+    if preflight is not None:
+        _, message = preflight.result()
+    else:
+        _, message = ensure_pages_project(project_name, account_id)
+    print(f"   {message}")
+    
+    pages_urls = []
+    
+    def capture_url(line):
+        match = PAGES_URL_PATTERN.search(line)
+        if match:
+            pages_urls.append(match.group(0))
+    
+    args = ['pages', 'deploy', str(source_dir), '--project-name', project_name,
+            '--branch', 'main', '--commit-dirty=true']
+    success, output = run_wrangler_command(args, account_id, stream=True, on_line=capture_url)
     
-    cmd = f'wrangler pages deploy "{source_dir}" --project-name {project_name} --branch main --commit-dirty=true'
-    success, stdout, stderr = run_wrangler_command(cmd, account_id)
+    if (not success and message == CACHED_PROJECT_MESSAGE
+            and PROJECT_MISSING_PATTERN.search(output)):
+        # Cached state was stale (project deleted) - recreate and retry once
+        print("   Project no longer exists, recreating...")
+        set_project_verified(project_name, account_id, verified=False)
+        _, message = ensure_pages_project(project_name, account_id)
+        print(f"   {message}")
+        success, output = run_wrangler_command(args, account_id, stream=True, on_line=capture_url)
     
     if not success:
-        print(f"❌ Deployment failed:")
-        print(stderr)
+        print(f"❌ Deployment failed")
         sys.exit(1)
     
-    print(stdout)
-    
-    output = stdout + stderr
-    import re
-    for line in output.split('\n'):
-        if '.pages.dev' in line:
-            match = re.search(r'https://[^\s]+\.pages\.dev', line)
-            if match:
-                return match.group(0)
+    set_project_verified(project_name, account_id)
     
+    if pages_urls:
+        return pages_urls[0]
     return f"https://{project_name}.pages.dev"
 
 
 def main():
     no_open = "--no-open" in sys.argv
     local_only = "--local-only" in sys.argv
+    no_dedupe = "--no-dedupe" in sys.argv
+    no_press = "--no-press" in sys.argv
+    no_people = "--no-people" in sys.argv
     
     print("=" * 60)
     print("🚀 RAMMP Website Deployment (Cloudflare Pages)")
@@ -373,11 +491,25 @@ def main():
     password_hash = hash_password(config['password'])
     print(f"\n🔑 Password configured (hash: {password_hash[:8]}...)")
     
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory() as tmpdir, ThreadPoolExecutor(max_workers=1) as pool:
         output_dir = Path(tmpdir)
         
+        # Project setup runs in the background while the site is built
+        preflight = None
+        if not local_only:
+            preflight = pool.submit(ensure_pages_project, config['project_name'], config['account_id'])
+        
         wrap_site_files(password_hash, output_dir)
         
+        if not no_press:
+            generate_press_section(output_dir)
+        
+        if not no_people:
+            generate_people_section(output_dir)
+        
+        if not no_dedupe:
+            dedupe_site_images(output_dir)
+        
         if local_only:
             local_output = SCRIPT_DIR / "site-protected"
             if local_output.exists():
@@ -388,7 +520,8 @@ def main():
             pages_url = deploy_to_cloudflare(
                 output_dir,
                 config['project_name'],
-                config['account_id']
+                config['account_id'],
+                preflight
             )
             
             print("\n" + "=" * 60)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Find duplicate and near-duplicate images and point HTML at one canonical copy.
+
+Exact duplicates are matched by SHA-256 of the file bytes. Near-duplicates
+(the same picture saved as .jpg and .png) are found by a 64-bit difference
+hash (dHash) of the image with any transparency flattened, so a transparent
+PNG matches the JPEG exported from it. A dHash match is only merged when the
+two images have the same pixel size and their flattened pixels are nearly
+equal; other dHash matches are reported as similar but never merged.
+
+Usage:
+    python dedupe_images.py                 # Report duplicate groups only
+    python dedupe_images.py --apply         # Rewrite HTML and delete verified duplicates
+    python dedupe_images.py --threshold 0   # Exact duplicates only
+
+Also used by deploy_site.py as a build stage on the staged output directory,
+where only byte-identical duplicates are merged.
+
+Dependencies:
+    pip install Pillow   (optional - without it only exact duplicates are found)
+"""
+import argparse
+import functools
+import hashlib
+import re
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageChops, ImageStat
+except ImportError:
+    Image = None  # Perceptual matching disabled, exact matching still works
+
+SITE_ROOT = Path(__file__).parent.parent
+IMAGES_SUBDIR = Path("assets") / "images"
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+DEFAULT_THRESHOLD = 4  # Max differing dHash bits for a near-duplicate
+ASPECT_TOLERANCE = 0.02  # Near-duplicates must share an aspect ratio
+PIXEL_TOLERANCE = 2.0  # Max mean per-channel difference (0-255) to merge
+COMPARE_SIZE = 256  # Long side of the images compared pixel by pixel
+
+WHITE = (255, 255, 255, 255)
+BLACK = (0, 0, 0, 255)
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dhash(img) -> int:
+    """Compute a 64-bit difference hash of an RGBA image."""
+    pixels = img.convert('L').resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+@functools.lru_cache(maxsize=None)
+def perceptual_info(path: Path):
+    """Return (dhashes, aspect_ratio, has_alpha, size) for an image, or None if unreadable.
+
+    Transparent images get two hashes, flattened onto white and onto black,
+    so an opaque export on either background is found as a candidate.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.draft('RGB', (64, 64))  # Cheap reduced decode for JPEG sources
+            has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+            rgba = img.convert('RGBA')
+    except (OSError, ValueError):
+        return None
+
+    backgrounds = [WHITE, BLACK] if has_alpha else [WHITE]
+    hashes = tuple(
+        _dhash(Image.alpha_composite(Image.new('RGBA', rgba.size, bg), rgba))
+        for bg in backgrounds
+    )
+    return hashes, width / height, has_alpha, (width, height)
+
+
+def _flattened(path: Path, size: tuple, background: tuple):
+    """Load an image resized to `size` and flattened onto `background` as RGB."""
+    with Image.open(path) as img:
+        rgba = img.convert('RGBA').resize(size, Image.Resampling.BOX)
+    return Image.alpha_composite(Image.new('RGBA', size, background), rgba).convert('RGB')
+
+
+def _content_box(img):
+    """Bounding box of the pixels that differ from the image's corner colour."""
+    background = Image.new('RGB', img.size, img.getpixel((0, 0)))
+    return ImageChops.difference(img, background).getbbox()
+
+
+def _union_box(box_a, box_b):
+    """Smallest box containing both boxes (either may be None)."""
+    boxes = [box for box in (box_a, box_b) if box]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def pixel_difference(path_a: Path, path_b: Path) -> float:
+    """Mean per-channel difference (0-255) between two same-sized images.
+
+    Two transparent images must match on both white and black. A transparent
+    and an opaque image are compared with the transparent one flattened on
+    white, the background the site renders logos on, so a logo on black is
+    never swapped for a transparent file that would show on white.
+    """
+    info_a, info_b = perceptual_info(path_a), perceptual_info(path_b)
+    width, height = info_a[3]
+    scale = min(1, COMPARE_SIZE / max(width, height))
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    def diff(bg_a, bg_b):
+        img_a, img_b = _flattened(path_a, size, bg_a), _flattened(path_b, size, bg_b)
+        # Compare only the area where either image has content, so a small
+        # logo on a large flat canvas can't average its differences away
+        box = _union_box(_content_box(img_a), _content_box(img_b))
+        if box is None:
+            box = (0, 0) + size
+        delta = ImageChops.difference(img_a.crop(box), img_b.crop(box))
+        return sum(ImageStat.Stat(delta).mean) / 3
+
+    if info_a[2] and info_b[2]:
+        return max(diff(WHITE, WHITE), diff(BLACK, BLACK))
+    return diff(WHITE, WHITE)
+
+
+def hash_distance(info_a, info_b) -> int:
+    """Smallest Hamming distance between any pair of the two images' hashes."""
+    return min(bin(a ^ b).count('1') for a in info_a[0] for b in info_b[0])
+
+
+def find_image_files(image_dir: Path) -> list:
+    """List image files under a directory, sorted for stable output."""
+    return sorted(
+        p for p in image_dir.rglob('*')
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def find_duplicate_groups(images: list, threshold: int = DEFAULT_THRESHOLD) -> tuple:
+    """Group images that are byte-identical or verified near-identical.
+
+    dHash only proposes candidates: mostly-flat images such as logos can hash
+    alike while looking different, so a candidate is merged only when both
+    images have the same pixel size and pixel_difference() is within
+    PIXEL_TOLERANCE. Merging never swaps a large image for a smaller copy.
+
+    Returns (groups, similar): groups is a list of lists of Paths with two or
+    more members; similar lists (path, path) dHash matches that were not
+    verified, for reporting only.
+    """
+    # Exact duplicates first: one representative per distinct digest
+    by_digest = {}
+    for path in images:
+        by_digest.setdefault(file_digest(path), []).append(path)
+    clusters = list(by_digest.values())
+    similar = []
+
+    if threshold > 0 and Image is not None:
+        infos = [perceptual_info(cluster[0]) for cluster in clusters]
+
+        # Union-find over clusters whose representatives look the same
+        parent = list(range(len(clusters)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(clusters)):
+            if infos[i] is None:
+                continue
+            for j in range(i + 1, len(clusters)):
+                if infos[j] is None:
+                    continue
+                aspect_i, aspect_j = infos[i][1], infos[j][1]
+                if abs(aspect_i - aspect_j) > ASPECT_TOLERANCE * max(aspect_i, aspect_j):
+                    continue
+                if hash_distance(infos[i], infos[j]) > threshold:
+                    continue
+                if find(i) == find(j):
+                    continue
+                if (infos[i][3] == infos[j][3]
+                        and pixel_difference(clusters[i][0], clusters[j][0]) <= PIXEL_TOLERANCE):
+                    parent[find(j)] = find(i)
+                else:
+                    similar.append((i, j))
+
+        # Report each pair of unmerged groups once
+        reported = set()
+        for i, j in similar:
+            key = frozenset((find(i), find(j)))
+            if len(key) == 2 and key not in reported:
+                reported.add(key)
+        similar = [(clusters[min(key)][0], clusters[max(key)][0]) for key in reported]
+        similar.sort()
+
+        merged = {}
+        for i, cluster in enumerate(clusters):
+            merged.setdefault(find(i), []).extend(cluster)
+        clusters = list(merged.values())
+
+    return [sorted(group) for group in clusters if len(group) > 1], similar
+
+
+def find_html_files(root: Path) -> list:
+    """List the top-level HTML pages of the site."""
+    return sorted(root.glob('*.html'))
+
+
+def reference_pattern(ref: str) -> re.Pattern:
+    """Match a site-relative image path as a whole token, literal or %20-encoded."""
+    variants = {ref, ref.replace(' ', '%20')}
+    alternatives = '|'.join(re.escape(v) for v in sorted(variants, key=len, reverse=True))
+    return re.compile(rf'(?<![\w.-])(?:{alternatives})(?![\w.-])')
+
+
+def count_references(html_texts: dict, ref: str) -> int:
+    """Count how many times a site-relative path is referenced across pages."""
+    pattern = reference_pattern(ref)
+    return sum(len(pattern.findall(text)) for text in html_texts.values())
+
+
+def choose_canonical(group: list, root: Path, html_texts: dict) -> Path:
+    """Pick the file to keep: most referenced, then transparent, URL-safe, smallest."""
+    def rank(path):
+        ref = path.relative_to(root).as_posix()
+        info = perceptual_info(path)
+        has_alpha = bool(info and info[2])
+        return (-count_references(html_texts, ref), not has_alpha, ' ' in ref,
+                path.stat().st_size, len(ref), ref)
+    return min(group, key=rank)
+
+
+def dedupe_site(root: Path = SITE_ROOT, apply: bool = False,
+                threshold: int = DEFAULT_THRESHOLD, verbose: bool = True) -> dict:
+    """Find duplicate images under root/assets/images and collapse them.
+
+    With apply=True, HTML pages under root are rewritten to reference the
+    canonical file of each group and the other files are deleted.
+    Pass threshold=0 to consider byte-identical files only.
+    Returns a summary dict with 'groups', 'similar', 'removed' and 'bytes_saved'.
+    """
+    root = Path(root)
+    image_dir = root / IMAGES_SUBDIR
+    summary = {'groups': [], 'similar': [], 'removed': 0, 'bytes_saved': 0}
+    if not image_dir.exists():
+        return summary
+
+    html_files = find_html_files(root)
+    html_texts = {path: path.read_text(encoding='utf-8') for path in html_files}
+    changed = set()
+
+    groups, summary['similar'] = find_duplicate_groups(find_image_files(image_dir), threshold)
+    for group in groups:
+        canonical = choose_canonical(group, root, html_texts)
+        canonical_ref = canonical.relative_to(root).as_posix()
+        duplicates = [p for p in group if p != canonical]
+        summary['groups'].append((canonical, duplicates))
+
+        if verbose:
+            print(f"   ✓ {canonical_ref}")
+        for dup in duplicates:
+            dup_ref = dup.relative_to(root).as_posix()
+            size = dup.stat().st_size
+            summary['removed'] += 1
+            summary['bytes_saved'] += size
+            if verbose:
+                print(f"       <- {dup_ref} ({size / 1024:.1f}KB)")
+            if not apply:
+                continue
+
+            pattern = reference_pattern(dup_ref)
+            for path, text in html_texts.items():
+                new_text = pattern.sub(lambda _: canonical_ref, text)
+                if new_text != text:
+                    html_texts[path] = new_text
+                    changed.add(path)
+            dup.unlink()
+
+    for path in changed:
+        path.write_text(html_texts[path], encoding='utf-8')
+
+    if verbose:
+        for path_a, path_b in summary['similar']:
+            print(f"   ? {path_a.relative_to(root).as_posix()} looks similar to "
+                  f"{path_b.relative_to(root).as_posix()} (not merged)")
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicate site image assets')
+    parser.add_argument('--root', type=Path, default=SITE_ROOT,
+                        help='Site root containing the HTML pages and assets/')
+    parser.add_argument('--apply', action='store_true',
+                        help='Rewrite HTML references and delete duplicates')
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help='Max differing dHash bits for near-duplicates (0 = exact only)')
+    args = parser.parse_args()
+
+    if Image is None and args.threshold > 0:
+        print("Pillow not installed - matching exact duplicates only.\n")
+
+    print(f"Scanning: {args.root / IMAGES_SUBDIR}\n")
+    summary = dedupe_site(args.root, apply=args.apply, threshold=args.threshold)
+
+    if not summary['groups']:
+        print("No duplicate images found.")
+        return
+
+    action = "Removed" if args.apply else "Would remove"
+    print(f"\n{action} {summary['removed']} files "
+          f"({summary['bytes_saved'] / 1024:.1f}KB) in {len(summary['groups'])} groups")
+    if not args.apply:
+        print("Run with --apply to rewrite HTML and delete duplicates.")
+
+
+if __name__ == "__main__":
+    main()
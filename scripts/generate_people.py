@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Generate the team directory in people.html from team-roster.md.
+
+Parses the roster's Markdown tables into member records, matches each member
+to an optimized headshot in assets/images/headshots, and renders the cards
+between the PEOPLE:START / PEOPLE:END markers in people.html.
+
+The page is only rewritten when the generated directory differs from what is
+already there; skipping that write is the main saving on rebuilds, and it
+leaves an unchanged people.html untouched in git. Rendered cards are also
+cached in .people-cache.json keyed by a digest of the member record, headshot
+and renderer, but rendering is cheap (about a millisecond for the whole
+roster), so the card cache saves little on its own.
+
+Usage:
+    python generate_people.py              # Update people.html from the roster
+    python generate_people.py --no-cache   # Re-render every card
+"""
+import argparse
+import hashlib
+import html
+import json
+import re
+import time
+from pathlib import Path
+
+SITE_ROOT = Path(__file__).parent.parent
+ROSTER_FILE = SITE_ROOT / "team-roster.md"
+CACHE_FILE = SITE_ROOT / ".people-cache.json"
+PEOPLE_PAGE = "people.html"
+HEADSHOTS_SUBDIR = Path("assets") / "images" / "headshots"
+
+HEADSHOT_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# Headshots whose filename doesn't follow the name conventions, keyed by the
+# slug of the roster name. Matching never guesses from a shared first or last
+# name, since that would put someone else's photo on a card.
+HEADSHOT_ALIASES = {
+    'brad-duerstock': 'duerstock',
+    'william': 'william-emfinger',
+    'alex': 'alex-stephens',
+    'mathieux-bergeron': 'mathieu-bergeron',
+    'jered-d': 'jered',
+}
+# Extra formats picked up from next to a headshot, offered via <picture>
+VARIANT_TYPES = {'.avif': 'image/avif', '.webp': 'image/webp'}
+
+# Roster sections that assign roles rather than list an organization's members
+LEADERSHIP_SECTIONS = {'Principal Investigator', 'Co-Principal Investigators'}
+SKIPPED_SECTIONS = {'Deactivated Members'}
+
+START_MARKER = "<!-- PEOPLE:START -->"
+END_MARKER = "<!-- PEOPLE:END -->"
+
+GROUP_TEMPLATE = '''            <h3 class="font-montserrat font-bold text-2xl text-near-black dark:text-white mb-6">{{ organization }}</h3>
+            <div class="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-5 gap-6 mb-12">
+{{ cards }}            </div>
+'''
+
+CARD_TEMPLATE = '''                <div class="bg-white dark:bg-gray-800 rounded-xl shadow-lg p-6 text-center border border-gray-100 dark:border-gray-700">
+                    {{ photo }}
+                    <h4 class="font-montserrat font-bold text-near-black dark:text-white mb-1">{{ name }}</h4>
+                    <p class="font-raleway text-sm text-dark-gray dark:text-gray-300">{{ role }}</p>
+                </div>
+'''
+
+IMG_TEMPLATE = '<img src="{{ src }}" alt="{{ alt }}" loading="lazy" decoding="async" class="w-20 h-20 rounded-full object-cover mx-auto shadow-lg mb-4">'
+
+SOURCE_TEMPLATE = '<source srcset="{{ src }}" type="{{ type }}">'
+
+INITIALS_TEMPLATE = '<div class="w-20 h-20 rounded-full bg-bright-blue/20 text-bright-blue flex items-center justify-center mx-auto mb-4 font-montserrat font-bold text-xl" aria-hidden="true">{{ initials }}</div>'
+
+
+def compile_template(text: str):
+    """Compile a {{ field }} template into a render function.
+
+    The template is split into literal and field parts once, so rendering is
+    a single join. Values are inserted as-is; callers escape where needed.
+    """
+    parts = re.split(r'\{\{\s*(\w+)\s*\}\}', text)
+    literals, fields = parts[0::2], parts[1::2]
+
+    def render(**values) -> str:
+        out = [literals[0]]
+        for field, literal in zip(fields, literals[1:]):
+            out.append(values[field])
+            out.append(literal)
+        return ''.join(out)
+
+    return render
+
+
+render_group = compile_template(GROUP_TEMPLATE)
+render_card_html = compile_template(CARD_TEMPLATE)
+render_img = compile_template(IMG_TEMPLATE)
+render_source = compile_template(SOURCE_TEMPLATE)
+render_initials = compile_template(INITIALS_TEMPLATE)
+
+# Changing the templates or this script invalidates every cached card
+RENDER_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def slugify(text: str) -> str:
+    """Lowercase, hyphen-separated form of a name."""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def parse_name(raw: str) -> tuple:
+    """Split a roster name cell into (name, nickname), dropping bold markers."""
+    name = raw.replace('**', '').strip()
+    match = re.match(r'^(.*?)\s*\(([^)]+)\)\s*$', name)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return name, ''
+
+
+def plain_name(name: str) -> str:
+    """Drop a trailing credential such as ', Ph.D.' from a name."""
+    return name.split(',')[0].strip()
+
+
+def parse_roster(text: str) -> list:
+    """Parse team-roster.md into member records.
+
+    Each record is a dict with name, nickname, email, organization and role.
+    Leadership roles are attached to the matching member of an organization
+    table; leaders not listed under any organization are added on their own.
+    """
+    members = {}
+    leaders = {}
+    section = ''
+    header = None
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith('## '):
+            section = line[3:].strip()
+            header = None
+            continue
+        if not line.startswith('|'):
+            header = None
+            continue
+        if section in SKIPPED_SECTIONS:
+            continue
+
+        cells = [c.strip() for c in line.strip('|').split('|')]
+        if header is None:
+            header = [c.lower() for c in cells]
+            continue
+        if all(set(c) <= set('-: ') for c in cells):
+            continue  # Table separator row
+
+        row = dict(zip(header, cells))
+        name, nickname = parse_name(row.get('name', ''))
+        email = row.get('email', '').lower()
+        if not name:
+            continue
+
+        record = {
+            'name': name,
+            'nickname': nickname,
+            'email': email,
+            'organization': row.get('organization') or re.sub(r'\s*\(.*\)$', '', section),
+            'role': row.get('role', '') if section in LEADERSHIP_SECTIONS else '',
+        }
+        target = leaders if section in LEADERSHIP_SECTIONS else members
+        target.setdefault(email or name, record)
+
+    for key, leader in leaders.items():
+        if key in members:
+            members[key]['role'] = leader['role']
+
+    # Leaders missing from the organization tables go first in their group
+    unlisted = [leader for key, leader in leaders.items() if key not in members]
+    return unlisted + list(members.values())
+
+
+def find_headshot(member: dict, headshots: dict) -> str:
+    """Match a member to a headshot filename, or '' if none fits.
+
+    headshots maps lowercase stem -> filename. Tries the full name, first/last,
+    nickname, first name + organization, then HEADSHOT_ALIASES. A bare first
+    or last name only matches a roster entry that is itself a single name.
+    """
+    full = slugify(plain_name(member['name']))
+    words = full.split('-')
+    candidates = [
+        full,
+        f"{words[0]}-{words[-1]}",
+        slugify(member['nickname']),
+        f"{words[0]}-{slugify(member['organization'])}",
+        HEADSHOT_ALIASES.get(full, ''),
+    ]
+    for stem in candidates:
+        if stem and stem in headshots:
+            return headshots[stem]
+    return ''
+
+
+def index_headshots(headshots_dir: Path) -> dict:
+    """Map lowercase stem -> filename for optimized headshots."""
+    if not headshots_dir.exists():
+        return {}
+    return {
+        p.stem.lower(): p.name
+        for p in sorted(headshots_dir.iterdir())
+        if p.suffix.lower() in HEADSHOT_EXTENSIONS
+    }
+
+
+def headshot_variants(headshots_dir: Path, filename: str) -> list:
+    """List (filename, mime type) for alternate formats next to a headshot."""
+    stem = Path(filename).stem
+    return [
+        (f"{stem}{ext}", mime)
+        for ext, mime in VARIANT_TYPES.items()
+        if (headshots_dir / f"{stem}{ext}").exists()
+    ]
+
+
+def initials(name: str) -> str:
+    """Up to two initials for the placeholder avatar."""
+    words = [w for w in re.split(r'[\s-]+', plain_name(name)) if w[:1].isalpha()]
+    if not words:
+        return '?'
+    if len(words) == 1:
+        return words[0][0].upper()
+    return (words[0][0] + words[-1][0]).upper()
+
+
+def render_card(member: dict, headshot: str, variants: list) -> str:
+    """Render one member card."""
+    alt = html.escape(member['name'])
+    if headshot:
+        base = HEADSHOTS_SUBDIR.as_posix()
+        photo = render_img(src=html.escape(f"{base}/{headshot}"), alt=alt)
+        if variants:
+            sources = ''.join(
+                render_source(src=html.escape(f"{base}/{name}"), type=mime)
+                for name, mime in variants
+            )
+            photo = f"<picture>{sources}{photo}</picture>"
+    else:
+        photo = render_initials(initials=html.escape(initials(member['name'])))
+    return render_card_html(
+        photo=photo,
+        name=alt,
+        role=html.escape(member['role']),
+    )
+
+
+def card_digest(member: dict, headshot: str, variants: list) -> str:
+    """Digest of everything a card's markup depends on."""
+    payload = json.dumps([RENDER_VERSION, member, headshot, variants], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_cache(cache_file: Path = CACHE_FILE) -> dict:
+    """Load the rendered-card cache."""
+    try:
+        return json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict, cache_file: Path = CACHE_FILE):
+    """Write the rendered-card cache."""
+    cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding='utf-8')
+
+
+def render_directory(members: list, root: Path, cache: dict) -> tuple:
+    """Render the directory, reusing cached cards (a minor saving).
+
+    Returns (html, rendered_count). Entries for members no longer in the
+    roster are dropped from the cache.
+    """
+    headshots_dir = root / HEADSHOTS_SUBDIR
+    headshots = index_headshots(headshots_dir)
+    groups = {}
+    used = {}
+    rendered = 0
+
+    for member in members:
+        headshot = find_headshot(member, headshots)
+        variants = headshot_variants(headshots_dir, headshot) if headshot else []
+        key = member['email'] or slugify(member['name'])
+        digest = card_digest(member, headshot, variants)
+
+        entry = cache.get(key)
+        if not entry or entry.get('digest') != digest:
+            entry = {'digest': digest, 'html': render_card(member, headshot, variants)}
+            rendered += 1
+        used[key] = entry
+        groups.setdefault(member['organization'], []).append(entry['html'])
+
+    cache.clear()
+    cache.update(used)
+
+    body = '\n'.join(
+        render_group(organization=html.escape(org), cards=''.join(cards))
+        for org, cards in groups.items()
+    )
+    return f"{START_MARKER}\n{body}            {END_MARKER}", rendered
+
+
+def inject_directory(page_path: Path, directory: str) -> str:
+    """Replace the content between the people markers in a page.
+
+    Returns 'updated', 'unchanged' or 'missing' (no markers in the page).
+    """
+    text = page_path.read_text(encoding='utf-8')
+    pattern = re.compile(re.escape(START_MARKER) + r'.*?' + re.escape(END_MARKER), re.DOTALL)
+    match = pattern.search(text)
+    if not match:
+        return 'missing'
+    if match.group(0) == directory:
+        return 'unchanged'
+    page_path.write_text(text[:match.start()] + directory + text[match.end():], encoding='utf-8')
+    return 'updated'
+
+
+def generate_people(page_path: Path, root: Path = SITE_ROOT, roster_file: Path = ROSTER_FILE,
+                    cache_file: Path = CACHE_FILE, use_cache: bool = True,
+                    verbose: bool = True) -> dict:
+    """Render the roster into the directory section of page_path.
+
+    Returns a summary dict with 'members', 'rendered' and 'page' status.
+    """
+    members = parse_roster(roster_file.read_text(encoding='utf-8'))
+    cache = load_cache(cache_file) if use_cache else {}
+    before = dict(cache)
+
+    directory, rendered = render_directory(members, Path(root), cache)
+    status = inject_directory(page_path, directory)
+    if cache != before:
+        save_cache(cache, cache_file)
+
+    if verbose:
+        print(f"   ✓ {len(members)} members ({rendered} rendered, "
+              f"{len(members) - rendered} cached), {page_path.name} {status}")
+        if status == 'missing':
+            print(f"   ! No people markers in {page_path.name}")
+
+    return {'members': len(members), 'rendered': rendered, 'page': status}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the people directory from the roster')
+    parser.add_argument('--page', type=Path, default=SITE_ROOT / PEOPLE_PAGE,
+                        help='HTML page containing the PEOPLE:START/END markers')
+    parser.add_argument('--roster', type=Path, default=ROSTER_FILE,
+                        help='Markdown roster to read')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-render every card')
+    args = parser.parse_args()
+
+    print(f"Generating team directory in: {args.page}\n")
+    start = time.perf_counter()
+    generate_people(args.page, roster_file=args.roster, use_cache=not args.no_cache)
+    print(f"\nDone in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
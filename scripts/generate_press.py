@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Generate the press coverage section from the media traction CSV.
+
+Reads article URLs from "Kickoff Media Traction(Sheet1).csv" and adds a press
+card between the PRESS:START / PRESS:END markers in publications.html for each
+article that doesn't have one yet. Cards already in the page are curated and
+kept as they are. New articles get their title and source from the page's
+OpenGraph metadata, fetched concurrently and kept in .press-cache.json so
+rebuilds only fetch URLs that are new or expired. An article whose metadata
+can't be fetched is left out rather than shown as a bare host name.
+
+Usage:
+    python generate_press.py                # Add cards for new articles to publications.html
+    python generate_press.py --offline      # Use cached metadata only, no network
+    python generate_press.py --refresh      # Ignore the cache and refetch everything
+
+Run it on the source tree to review and commit new cards (editing titles as
+needed). deploy_site.py also runs it on the staged copy, so articles added to
+the CSV since the last commit still appear.
+"""
+import argparse
+import asyncio
+import codecs
+import csv
+import html
+import http.client
+import json
+import re
+import time
+import urllib.error
+import urllib.request
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlparse
+
+SITE_ROOT = Path(__file__).parent.parent
+PRESS_CSV = SITE_ROOT / "Kickoff Media Traction(Sheet1).csv"
+CACHE_FILE = SITE_ROOT / ".press-cache.json"
+PRESS_PAGE = "publications.html"
+
+CACHE_TTL = 7 * 24 * 3600  # Successful fetches are reused for a week
+ERROR_TTL = 24 * 3600  # Failed fetches are retried after a day
+MAX_CONCURRENCY = 8
+FETCH_TIMEOUT = 10  # Seconds per request
+MAX_HEAD_BYTES = 512 * 1024  # OpenGraph tags live in <head>; don't download whole pages
+USER_AGENT = "Mozilla/5.0 (compatible; RAMMP-press-bot/1.0; +https://rammp.tech)"
+
+START_MARKER = "<!-- PRESS:START -->"
+END_MARKER = "<!-- PRESS:END -->"
+
+PRESS_RELEASE_HOSTS = {'prnewswire.com'}
+# Not articles (social feeds, newsletters) or reposts of a linked press release
+SKIP_HOSTS = {'linkedin.com', 'mailchi.mp', 'streetinsider.com', 'kxan.com',
+              'investorshangout.com'}
+
+BADGE_CLASSES = {
+    'University News': 'bg-bright-blue/10 dark:bg-bright-blue/20 text-bright-blue',
+    'Press Release': 'bg-orange-100 dark:bg-orange-900 text-orange-800 dark:text-orange-200',
+    'News': 'bg-bright-blue/10 dark:bg-bright-blue/20 text-bright-blue',
+}
+
+CARD_TEMPLATE = '''                <!-- {comment} -->
+                <a href="{url}" target="_blank" rel="noopener noreferrer" class="bg-white dark:bg-gray-900 rounded-xl shadow-lg p-6 card-hover border border-gray-100 dark:border-gray-700 block">
+                    <span class="inline-block px-3 py-1 {badge_class} rounded-full text-sm font-raleway mb-3">{badge}</span>
+                    <h3 class="font-montserrat font-bold text-lg text-near-black dark:text-white mb-2">{title}</h3>
+                    <p class="font-raleway text-sm text-dark-gray dark:text-gray-300">{source}</p>
+                </a>
+'''
+
+# One card inside the markers, with the optional comment line above it
+CARD_PATTERN = re.compile(r'(?:[ \t]*<!--(?:(?!-->).)*-->\n)?[ \t]*<a href="([^"]*)".*?</a>\n',
+                          re.DOTALL)
+MARKERS_PATTERN = re.compile(re.escape(START_MARKER) + r'.*?' + re.escape(END_MARKER), re.DOTALL)
+
+
+class OpenGraphParser(HTMLParser):
+    """Collect OpenGraph/article meta tags and the <title> from a page head."""
+
+    def __init__(self):
+        super().__init__()
+        self.meta = {}
+        self.title = ''
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            key = attrs.get('property') or attrs.get('name') or ''
+            content = attrs.get('content')
+            if content and (key.startswith('og:') or key.startswith('article:')):
+                self.meta.setdefault(key, content.strip())
+        elif tag == 'title':
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def read_press_urls(csv_path: Path = PRESS_CSV) -> list:
+    """Read article URLs from the first column of the CSV, dropping duplicates."""
+    urls = []
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.reader(f):
+            if row and row[0].strip().startswith('http') and row[0].strip() not in urls:
+                urls.append(row[0].strip())
+    return urls
+
+
+def parse_metadata(page: str) -> dict:
+    """Extract title, site name, description and publish date from page HTML."""
+    parser = OpenGraphParser()
+    try:
+        parser.feed(page)
+    except Exception:
+        pass  # Keep whatever was parsed before the malformed markup
+    meta = parser.meta
+    return {
+        'title': meta.get('og:title') or ' '.join(parser.title.split()),
+        'site_name': meta.get('og:site_name', ''),
+        'description': meta.get('og:description', ''),
+        'image': meta.get('og:image', ''),
+        'published': meta.get('article:published_time', ''),
+    }
+
+
+def fetch_page_head(url: str) -> str:
+    """Download the start of a page (blocking), decoding unknown charsets as UTF-8."""
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = 'utf-8'
+        return response.read(MAX_HEAD_BYTES).decode(charset, errors='replace')
+
+
+async def fetch_metadata(url: str, semaphore: asyncio.Semaphore) -> dict:
+    """Fetch one URL's metadata, returning a cache entry.
+
+    Any network or protocol failure is recorded as an 'error' entry, which
+    renders as a card labelled with the host name.
+    """
+    async with semaphore:
+        try:
+            page = await asyncio.to_thread(fetch_page_head, url)
+        except (urllib.error.URLError, http.client.HTTPException,
+                OSError, ValueError, LookupError) as e:
+            return {'fetched_at': time.time(), 'error': str(e)}
+    return {'fetched_at': time.time(), 'meta': parse_metadata(page)}
+
+
+async def fetch_all(urls: list, concurrency: int = MAX_CONCURRENCY) -> dict:
+    """Fetch metadata for all URLs concurrently, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    entries = await asyncio.gather(*(fetch_metadata(url, semaphore) for url in urls))
+    return dict(zip(urls, entries))
+
+
+def load_cache(cache_file: Path = CACHE_FILE) -> dict:
+    """Load the metadata cache."""
+    try:
+        return json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict, cache_file: Path = CACHE_FILE):
+    """Write the metadata cache."""
+    cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding='utf-8')
+
+
+def is_fresh(entry: dict, now: float) -> bool:
+    """Check whether a cache entry is still within its TTL."""
+    ttl = ERROR_TTL if 'error' in entry else CACHE_TTL
+    return now - entry.get('fetched_at', 0) < ttl
+
+
+def update_cache(urls: list, cache: dict, offline: bool = False,
+                 refresh: bool = False, concurrency: int = MAX_CONCURRENCY) -> list:
+    """Fetch metadata for URLs missing from or expired in the cache.
+
+    Returns the URLs that were requested (successfully or not).
+    """
+    now = time.time()
+    stale = [url for url in urls
+             if refresh or url not in cache or not is_fresh(cache[url], now)]
+    if offline or not stale:
+        return []
+    cache.update(asyncio.run(fetch_all(stale, concurrency)))
+    return stale
+
+
+def source_name(url: str) -> str:
+    """Fallback source label from the URL host."""
+    host = urlparse(url).hostname or url
+    return host[4:] if host.startswith('www.') else host
+
+
+def is_skipped(url: str) -> bool:
+    """Check whether a URL is on a host that never gets a card."""
+    host = source_name(url)
+    return any(host == skip or host.endswith('.' + skip) for skip in SKIP_HOSTS)
+
+
+def classify(url: str) -> str:
+    """Pick the badge label for an article."""
+    host = source_name(url)
+    if host.endswith('.edu'):
+        return 'University News'
+    if host in PRESS_RELEASE_HOSTS or 'press-release' in url:
+        return 'Press Release'
+    return 'News'
+
+
+def clean_title(title: str, site_name: str) -> str:
+    """Drop a trailing ' | Site Name' or ' - Site Name' suffix from a title."""
+    if site_name:
+        pattern = rf'\s*[|\-–—]\s*{re.escape(site_name)}\s*$'
+        title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+    return title.strip()
+
+
+def render_card(url: str, meta: dict) -> str:
+    """Render one press card from fetched metadata, or '' if it has no title."""
+    source = meta.get('site_name') or source_name(url)
+    title = clean_title(meta.get('title', ''), source)
+    if not title:
+        return ''
+    badge = classify(url)
+    return CARD_TEMPLATE.format(
+        comment=source.replace('--', '-'),
+        url=html.escape(url),
+        badge=badge,
+        badge_class=BADGE_CLASSES[badge],
+        title=html.escape(title),
+        source=html.escape(source),
+    )
+
+
+def read_existing_cards(page_path: Path):
+    """Return [(url, card_html)] for the cards between the press markers.
+
+    Returns None if the page has no markers.
+    """
+    match = MARKERS_PATTERN.search(page_path.read_text(encoding='utf-8'))
+    if not match:
+        return None
+    return [(html.unescape(card.group(1)), card.group(0))
+            for card in CARD_PATTERN.finditer(match.group(0))]
+
+
+def render_press_grid(cards: list) -> str:
+    """Render the press card grid around already-rendered cards."""
+    cards = '\n'.join(cards)
+    return (f'{START_MARKER}\n'
+            f'            <div class="grid md:grid-cols-2 lg:grid-cols-3 gap-6">\n'
+            f'{cards}'
+            f'            </div>\n'
+            f'            {END_MARKER}')
+
+
+def inject_press_grid(page_path: Path, grid: str) -> bool:
+    """Replace the content between the press markers in a page.
+
+    Returns False if the page has no markers. The page is only written when
+    its content changes.
+    """
+    text = page_path.read_text(encoding='utf-8')
+    if not MARKERS_PATTERN.search(text):
+        return False
+    new_text = MARKERS_PATTERN.sub(lambda _: grid, text, count=1)
+    if new_text != text:
+        page_path.write_text(new_text, encoding='utf-8')
+    return True
+
+
+def generate_press(page_path: Path, offline: bool = False, refresh: bool = False,
+                   concurrency: int = MAX_CONCURRENCY, csv_path: Path = PRESS_CSV,
+                   cache_file: Path = CACHE_FILE, verbose: bool = True) -> dict:
+    """Add cards for CSV articles that page_path doesn't list yet.
+
+    Existing cards are never changed. Returns a summary dict with 'urls',
+    'on_page', 'skipped', 'cached', 'fetched', 'failed', 'added' and
+    'injected'; cached + fetched + failed covers the new articles.
+    """
+    summary = {'urls': 0, 'on_page': 0, 'skipped': 0, 'cached': 0, 'fetched': 0,
+               'failed': 0, 'added': 0, 'injected': False}
+    existing = read_existing_cards(page_path)
+    if existing is None:
+        if verbose:
+            print(f"   ! No press markers in {page_path.name}")
+        return summary
+
+    urls = read_press_urls(csv_path)
+    on_page = {url for url, _ in existing}
+    skipped = [url for url in urls if url not in on_page and is_skipped(url)]
+    new = [url for url in urls if url not in on_page and url not in skipped]
+
+    cache = load_cache(cache_file)
+    requested = update_cache(new, cache, offline, refresh, concurrency)
+    if requested:
+        save_cache(cache, cache_file)
+
+    cards = [card for _, card in existing]
+    failed = []
+    for url in new:
+        card = render_card(url, cache[url]['meta']) if 'meta' in cache.get(url, {}) else ''
+        if card:
+            cards.append(card)
+        else:
+            failed.append(url)
+
+    summary.update(
+        urls=len(urls),
+        on_page=len(urls) - len(skipped) - len(new),
+        skipped=len(skipped),
+        fetched=len(set(requested) - set(failed)),
+        failed=len(failed),
+        added=len(new) - len(failed),
+        injected=inject_press_grid(page_path, render_press_grid(cards)),
+    )
+    summary['cached'] = summary['added'] - summary['fetched']
+
+    if verbose:
+        print(f"   ✓ {summary['urls']} articles: {summary['on_page']} already on the page, "
+              f"{summary['skipped']} skipped, {len(new)} new")
+        if new:
+            print(f"   ✓ {summary['added']} cards added ({summary['cached']} cached, "
+                  f"{summary['fetched']} fetched)")
+        for url in failed:
+            print(f"   ! No metadata for {url}, not added")
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add press cards for new articles in the media CSV')
+    parser.add_argument('--page', type=Path, default=SITE_ROOT / PRESS_PAGE,
+                        help='HTML page containing the PRESS:START/END markers')
+    parser.add_argument('--csv', type=Path, default=PRESS_CSV,
+                        help='CSV file with one article URL per row')
+    parser.add_argument('--offline', action='store_true',
+                        help='Use cached metadata only, without network requests')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Refetch all URLs regardless of cache age')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help='Maximum simultaneous requests')
+    args = parser.parse_args()
+
+    print(f"Updating press section in: {args.page}\n")
+    start = time.perf_counter()
+    generate_press(args.page, args.offline, args.refresh, args.concurrency, args.csv)
+    print(f"\nDone in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,29 @@
 Optimize headshot images for web use.
 Resizes to max 400x400px and compresses to JPEG format.
 Target size: ~50-150KB per image.
+
+JPEG sources are decoded at reduced resolution (DCT scaling) and other
+formats are shrunk before any mode conversion, so a 12 MP photo never
+needs a full-size RGB buffer.
+
+Usage:
+    python optimize-headshots.py              # Optimize all headshots in place
+    python optimize-headshots.py --benchmark  # Compare against the previous decoding
 """
 
 import os
+import sys
+import time
+import tempfile
+import subprocess
 from pathlib import Path
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageFilter
 except ImportError:
     print("Installing Pillow...")
     os.system("pip install Pillow")
-    from PIL import Image
+    from PIL import Image, ImageFilter
 
 try:
     import pillow_heif
@@ -26,6 +38,45 @@ MAX_SIZE = (400, 400)  # Max dimensions for headshots
 JPEG_QUALITY = 85  # Good balance of quality and file size
 
 
+def target_size(size: tuple) -> tuple:
+    """Final dimensions for an image of `size` fitted inside MAX_SIZE."""
+    scale = min(MAX_SIZE[0] / size[0], MAX_SIZE[1] / size[1], 1)
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+
+def load_resized(input_path: Path) -> Image.Image:
+    """Decode an image at reduced resolution and shrink it to MAX_SIZE.
+    
+    Returns an RGB image no larger than MAX_SIZE. Apart from palette images,
+    peak memory is one decoded source frame (DCT-scaled for JPEG) with no
+    extra full-size copy.
+    """
+    with Image.open(input_path) as img:
+        target = target_size(img.size)
+        
+        # JPEG: libjpeg decodes at 1/2, 1/4 or 1/8 scale, still >= target.
+        # No-op for formats without reduced decoding.
+        img.draft('RGB', target)
+        
+        # Palette images can't be box-reduced or resized smoothly
+        if img.mode in ('1', 'P'):
+            img = img.convert('RGBA')
+        
+        # Cheap integer box reduction, keeping 2x the target for LANCZOS,
+        # so the mode conversion below runs on a small image
+        factor = min(img.width // (2 * target[0]), img.height // (2 * target[1]))
+        if factor > 1:
+            img = img.reduce(factor)
+        
+        # Convert to RGB if necessary (for PNG with transparency)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        img.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
+        img.load()
+        return img.copy()
+
+
 def optimize_image(input_path: Path) -> None:
     """Optimize a single image file."""
     print(f"Processing: {input_path.name}")
@@ -33,20 +84,13 @@ def optimize_image(input_path: Path) -> None:
     # Get original size
     original_size = input_path.stat().st_size / 1024  # KB
     
-    # Open and convert image
-    with Image.open(input_path) as img:
-        # Convert to RGB if necessary (for PNG with transparency)
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        
-        # Resize if larger than max size (maintain aspect ratio)
-        img.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
-        
-        # Create output filename (always .jpg for consistency)
-        output_path = input_path.with_suffix('.jpg')
-        
-        # Save optimized image
-        img.save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    img = load_resized(input_path)
+    
+    # Create output filename (always .jpg for consistency)
+    output_path = input_path.with_suffix('.jpg')
+    
+    # Save optimized image
+    img.save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=True)
     
     # Get new size
     new_size = output_path.stat().st_size / 1024  # KB
@@ -60,7 +104,96 @@ def optimize_image(input_path: Path) -> None:
     print(f"  {original_size:.1f}KB -> {new_size:.1f}KB ({reduction:.1f}% reduction)")
 
 
+def load_resized_full(input_path: Path) -> Image.Image:
+    """Previous approach: convert at full size, then resize.
+    
+    Kept as the baseline for --benchmark.
+    """
+    with Image.open(input_path) as img:
+        if img.mode in ('RGBA', 'P'):
+            img = img.convert('RGB')
+        img.thumbnail(MAX_SIZE, Image.Resampling.LANCZOS)
+        return img.copy()
+
+
+LOADERS = {'previous': load_resized_full, 'reduced': load_resized}
+
+
+def peak_memory_mb(loader_name: str, path: Path):
+    """Peak RSS in MB of a fresh interpreter running one loader, or None.
+    
+    Measured in a child process so earlier runs don't inflate the number.
+    Only available on Linux, where /proc reports the high-water mark.
+    """
+    result = subprocess.run(
+        [sys.executable, __file__, '--peak-memory', loader_name, str(path)],
+        capture_output=True, text=True
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def report_peak_memory(loader_name: str, path: str):
+    """Child side of peak_memory_mb: run the loader and print peak RSS."""
+    if loader_name in LOADERS:
+        LOADERS[loader_name](Path(path))
+    try:
+        status = Path('/proc/self/status').read_text()
+    except OSError:
+        return
+    for line in status.splitlines():
+        if line.startswith('VmHWM:'):
+            print(int(line.split()[1]) / 1024)  # kB -> MB
+
+
+def benchmark(runs: int = 5):
+    """Compare reduced and previous decoding on synthetic 12 MP photos."""
+    size = (4032, 3024)  # Typical 12 MP phone camera output
+    print(f"Benchmarking {size[0]}x{size[1]} sources, {runs} runs each\n")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Softened noise over gradients: compresses roughly like a real photo
+        base = Image.linear_gradient('L').resize(size)
+        noise = Image.effect_noise(size, 32).filter(ImageFilter.GaussianBlur(1.5))
+        photo = Image.merge('RGB', (base, noise, base.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+        
+        sources = {
+            'JPEG': Path(tmpdir) / 'photo.jpg',
+            'PNG (RGBA)': Path(tmpdir) / 'photo.png',
+        }
+        photo.save(sources['JPEG'], 'JPEG', quality=92)
+        photo.convert('RGBA').save(sources['PNG (RGBA)'], 'PNG', compress_level=1)
+        
+        del base, noise, photo
+        
+        baseline = peak_memory_mb('none', sources['JPEG'])
+        for label, path in sources.items():
+            print(f"{label}:")
+            timings = {}
+            for name, loader in LOADERS.items():
+                start = time.perf_counter()
+                for _ in range(runs):
+                    loader(path)
+                timings[name] = (time.perf_counter() - start) / runs
+                
+                peak = peak_memory_mb(name, path)
+                memory = f", +{peak - baseline:.0f}MB peak" if peak and baseline else ""
+                print(f"  {name + ':':10} {timings[name] * 1000:7.1f} ms/image{memory}")
+            print(f"  speedup: {timings['previous'] / timings['reduced']:.1f}x\n")
+
+
 def main():
+    if "--peak-memory" in sys.argv:
+        index = sys.argv.index("--peak-memory")
+        report_peak_memory(*sys.argv[index + 1:index + 3])
+        return
+    
+    if "--benchmark" in sys.argv:
+        benchmark()
+        return
+    
     print(f"Optimizing headshots in: {HEADSHOTS_DIR}\n")
     
     if not HEADSHOTS_DIR.exists():
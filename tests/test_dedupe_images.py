@@ -0,0 +1,117 @@
+"""Tests for scripts/dedupe_images.py using synthetic images."""
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import dedupe_images  # noqa: E402
+from dedupe_images import IMAGES_SUBDIR, dedupe_site, find_duplicate_groups  # noqa: E402
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+
+def draw_logo(text: str, background=(0, 0, 0, 0), size=(400, 100)):
+    """A short word on a large flat canvas, like a partner logo."""
+    img = Image.new('RGBA', size, background)
+    ImageDraw.Draw(img).text((150, 40), text, fill=(20, 40, 200, 255))
+    return img
+
+
+def draw_photo(size=(120, 80)):
+    """A smooth gradient with a shape, standing in for a photo."""
+    img = Image.new('RGB', size)
+    img.putdata([(x * 2, y * 3, (x + y) % 256) for y in range(size[1]) for x in range(size[0])])
+    ImageDraw.Draw(img).ellipse((30, 20, 90, 60), fill=(240, 200, 40))
+    return img
+
+
+@unittest.skipIf(Image is None, "Pillow not installed")
+class DedupeImagesTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.images = self.root / IMAGES_SUBDIR
+        self.images.mkdir(parents=True)
+        dedupe_images.perceptual_info.cache_clear()
+
+    def image_files(self):
+        return dedupe_images.find_image_files(self.images)
+
+    def test_exact_duplicate_is_merged(self):
+        draw_photo().save(self.images / 'photo.png')
+        shutil.copy(self.images / 'photo.png', self.images / 'photo-copy.png')
+
+        groups, similar = find_duplicate_groups(self.image_files(), threshold=0)
+
+        self.assertEqual(groups, [[self.images / 'photo-copy.png', self.images / 'photo.png']])
+        self.assertEqual(similar, [])
+
+    def test_jpg_png_pair_is_merged(self):
+        photo = draw_photo()
+        photo.save(self.images / 'photo.png')
+        photo.save(self.images / 'photo.jpg', quality=95)
+
+        groups, similar = find_duplicate_groups(self.image_files())
+
+        self.assertEqual(groups, [[self.images / 'photo.jpg', self.images / 'photo.png']])
+        self.assertEqual(similar, [])
+
+    def test_different_size_copy_is_only_reported(self):
+        photo = draw_photo()
+        photo.save(self.images / 'photo.png')
+        photo.resize((60, 40)).save(self.images / 'photo-small.png')
+
+        groups, similar = find_duplicate_groups(self.image_files())
+
+        self.assertEqual(groups, [])
+        self.assertEqual(len(similar), 1)
+
+    def test_distinct_logos_are_not_merged(self):
+        draw_logo('ACME').save(self.images / 'acme.png')
+        draw_logo('ZETA').save(self.images / 'zeta.png')
+        (self.root / 'index.html').write_text(
+            '<img src="assets/images/acme.png"><img src="assets/images/zeta.png">',
+            encoding='utf-8')
+
+        summary = dedupe_site(self.root, apply=True, verbose=False)
+
+        self.assertEqual(summary['groups'], [])
+        self.assertTrue((self.images / 'acme.png').exists())
+        self.assertTrue((self.images / 'zeta.png').exists())
+
+    def test_logo_on_black_is_not_swapped_for_transparent(self):
+        draw_logo('ACME').save(self.images / 'acme.png')
+        draw_logo('ACME', background=(0, 0, 0, 255)).convert('RGB').save(
+            self.images / 'acme-dark.png')
+
+        groups, similar = find_duplicate_groups(self.image_files())
+
+        self.assertEqual(groups, [])
+        self.assertEqual(len(similar), 1)
+
+    def test_encoded_reference_is_rewritten(self):
+        draw_photo().save(self.images / 'team photo.png')
+        shutil.copy(self.images / 'team photo.png', self.images / 'team-photo.png')
+        page = self.root / 'index.html'
+        page.write_text('<img src="assets/images/team%20photo.png">\n'
+                        '<img src="assets/images/team-photo.png">\n', encoding='utf-8')
+
+        summary = dedupe_site(self.root, apply=True, verbose=False)
+
+        self.assertEqual(summary['removed'], 1)
+        self.assertFalse((self.images / 'team photo.png').exists())
+        self.assertEqual(page.read_text(encoding='utf-8'),
+                         '<img src="assets/images/team-photo.png">\n'
+                         '<img src="assets/images/team-photo.png">\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
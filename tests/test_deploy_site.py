@@ -0,0 +1,134 @@
+"""Tests for the Cloudflare Pages deploy flow in deploy_site.py.
+
+A stub `wrangler` script on PATH records its calls and emulates the Pages
+project/deploy commands, so no network or Node.js is needed.
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import deploy_site  # noqa: E402
+
+FAKE_WRANGLER = textwrap.dedent('''\
+    #!{python}
+    import json, os, sys
+    from pathlib import Path
+
+    state = Path(os.environ['FAKE_WRANGLER_DIR'])
+    args = sys.argv[1:]
+    with open(state / 'calls.jsonl', 'a') as f:
+        f.write(json.dumps(args) + '\\n')
+
+    if args[:3] == ['pages', 'project', 'create']:
+        (state / ('project-' + args[3])).touch()
+        print('Successfully created the project.')
+    elif args[:2] == ['pages', 'deploy']:
+        project = args[args.index('--project-name') + 1]
+        if not (state / ('project-' + project)).exists():
+            print('Project not found. The specified project name does not match '
+                  'any of your existing projects. [code: 8000007]')
+            sys.exit(1)
+        if os.environ.get('FAKE_WRANGLER_FAIL'):
+            print('Authentication error [code: 10000]')
+            sys.exit(1)
+        print('Uploading... (3/3)', flush=True)
+        print('Deployment complete! Take a peek over at https://abc123.' + project + '.pages.dev')
+    else:
+        sys.exit(2)
+''')
+
+PROJECT = 'rammp-test'
+ACCOUNT = 'account-1'
+
+
+class DeployFlowTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+        bin_dir = self.tmp / 'bin'
+        bin_dir.mkdir()
+        wrangler = bin_dir / 'wrangler'
+        wrangler.write_text(FAKE_WRANGLER.format(python=sys.executable))
+        wrangler.chmod(0o755)
+
+        self.site = self.tmp / 'site'
+        self.site.mkdir()
+        env = {'PATH': f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+               'FAKE_WRANGLER_DIR': str(self.tmp)}
+        for patcher in (mock.patch.dict(os.environ, env),
+                        mock.patch.object(deploy_site, 'WRANGLER_STATE_FILE',
+                                          self.tmp / '.wrangler-state.json')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def calls(self) -> list:
+        """Subcommands the stub wrangler was run with, e.g. 'project create'."""
+        log = self.tmp / 'calls.jsonl'
+        if not log.exists():
+            return []
+        calls = []
+        for line in log.read_text().splitlines():
+            args = json.loads(line)
+            calls.append(' '.join(args[1:3]) if args[1] == 'project' else args[1])
+        return calls
+
+    def deploy(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            url = deploy_site.deploy_to_cloudflare(self.site, PROJECT, ACCOUNT)
+        return url, output.getvalue()
+
+    def test_stub_is_found_on_path(self):
+        self.assertTrue(deploy_site.check_wrangler_installed())
+        self.assertEqual(deploy_site.find_wrangler(), str(self.tmp / 'bin' / 'wrangler'))
+
+    def test_creates_project_once_then_uses_cache(self):
+        url, _ = self.deploy()
+        self.assertEqual(self.calls(), ['project create', 'deploy'])
+        self.assertEqual(url, f'https://abc123.{PROJECT}.pages.dev')
+        self.assertTrue(deploy_site.is_project_verified(PROJECT, ACCOUNT))
+
+        url, output = self.deploy()
+        self.assertEqual(self.calls(), ['project create', 'deploy', 'deploy'])
+        self.assertIn(deploy_site.CACHED_PROJECT_MESSAGE, output)
+        self.assertEqual(url, f'https://abc123.{PROJECT}.pages.dev')
+
+    def test_streams_deploy_output(self):
+        _, output = self.deploy()
+        self.assertIn('   Uploading... (3/3)', output)
+        self.assertIn('   Deployment complete!', output)
+
+    def test_stale_cache_recreates_project_and_retries_once(self):
+        deploy_site.set_project_verified(PROJECT, ACCOUNT)  # Project was deleted since
+
+        url, output = self.deploy()
+
+        self.assertEqual(self.calls(), ['deploy', 'project create', 'deploy'])
+        self.assertIn('Project no longer exists, recreating...', output)
+        self.assertEqual(url, f'https://abc123.{PROJECT}.pages.dev')
+        self.assertTrue(deploy_site.is_project_verified(PROJECT, ACCOUNT))
+
+    def test_other_failures_are_not_retried(self):
+        self.deploy()
+        with mock.patch.dict(os.environ, {'FAKE_WRANGLER_FAIL': '1'}):
+            with self.assertRaises(SystemExit):
+                self.deploy()
+
+        self.assertEqual(self.calls(), ['project create', 'deploy', 'deploy'])
+        self.assertTrue(deploy_site.is_project_verified(PROJECT, ACCOUNT))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Tests for headshot matching in scripts/generate_people.py."""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from generate_people import find_headshot  # noqa: E402
+
+HEADSHOTS = {
+    stem.lower(): stem + '.jpg'
+    for stem in ['rory-cooper', 'taskin-padir', 'Duerstock', 'tapo', 'owen-atdev', 'todd']
+}
+
+
+def member(name, organization='University of Pittsburgh', nickname=''):
+    return {'name': name, 'nickname': nickname, 'email': '',
+            'organization': organization, 'role': ''}
+
+
+class FindHeadshotTest(unittest.TestCase):
+
+    def test_full_name(self):
+        self.assertEqual(find_headshot(member('Rory Cooper, Ph.D.'), HEADSHOTS), 'rory-cooper.jpg')
+
+    def test_same_surname_without_headshot_gets_none(self):
+        self.assertEqual(find_headshot(member('Sam Cooper'), HEADSHOTS), '')
+        self.assertEqual(find_headshot(member('Kim Padir', 'Northeastern University'), HEADSHOTS), '')
+        self.assertEqual(find_headshot(member('Ann Duerstock', 'Purdue University'), HEADSHOTS), '')
+
+    def test_same_first_name_without_headshot_gets_none(self):
+        self.assertEqual(find_headshot(member('Rory Smith'), HEADSHOTS), '')
+        self.assertEqual(find_headshot(member('Todd Jones', 'Kinova'), HEADSHOTS), '')
+
+    def test_single_name_nickname_and_organization(self):
+        self.assertEqual(find_headshot(member('Todd', 'ATDev'), HEADSHOTS), 'todd.jpg')
+        self.assertEqual(find_headshot(member('Owen', 'ATDev'), HEADSHOTS), 'owen-atdev.jpg')
+        self.assertEqual(find_headshot(member('Tapomayukh Bhattacharjee', 'Cornell University',
+                                              nickname='Tapo'), HEADSHOTS), 'tapo.jpg')
+
+    def test_alias(self):
+        self.assertEqual(find_headshot(member('Brad Duerstock', 'Purdue University'), HEADSHOTS),
+                         'Duerstock.jpg')
+
+
+if __name__ == '__main__':
+    unittest.main()
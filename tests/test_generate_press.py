@@ -0,0 +1,227 @@
+"""Tests for scripts/generate_press.py against a local HTTP server."""
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import generate_press  # noqa: E402
+
+ARTICLE_PAGE = """<!DOCTYPE html>
+<html><head>
+<title>Fallback title</title>
+<meta property="og:title" content="Robotic Wheelchair Story {n} | Example News">
+<meta property="og:site_name" content="Example News">
+<meta property="article:published_time" content="2025-11-04T10:00:00Z">
+</head><body>Article {n}</body></html>
+"""
+
+PAGE_TEMPLATE = """<html><body>
+            <!-- PRESS:START -->
+            <div class="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
+                <!-- Curated -->
+                <a href="{url}" target="_blank" rel="noopener noreferrer" class="block">
+                    <h3 class="font-montserrat">Hand-Written Title</h3>
+                </a>
+            </div>
+            <!-- PRESS:END -->
+</body></html>
+"""
+
+RESPONSE_DELAY = 0.1  # Long enough for concurrent requests to overlap
+
+
+class PressHandler(BaseHTTPRequestHandler):
+    """Serve OpenGraph article pages plus a few broken responses."""
+
+    lock = threading.Lock()
+    requests = 0
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(RESPONSE_DELAY)
+            self.respond()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def respond(self):
+        if self.path == '/error':
+            self.send_error(500)
+            return
+        if self.path == '/garbage':
+            # Not an HTTP response at all: http.client raises BadStatusLine
+            self.wfile.write(b'NOT HTTP\r\n\r\n')
+            self.close_connection = True
+            return
+
+        charset = 'bogus-charset' if self.path == '/bogus-charset' else 'utf-8'
+        body = ARTICLE_PAGE.format(n=self.path.rsplit('/', 1)[-1]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'text/html; charset={charset}')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def unused_port() -> int:
+    """Return a local port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class GeneratePressTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.env = mock.patch.dict(os.environ, {'no_proxy': '127.0.0.1'})
+        cls.env.start()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), PressHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.env.stop()
+
+    def setUp(self):
+        PressHandler.requests = PressHandler.in_flight = PressHandler.max_in_flight = 0
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.page = self.tmp / 'publications.html'
+        self.curated_url = f'{self.base_url}/article/curated'
+        self.page.write_text(PAGE_TEMPLATE.format(url=self.curated_url), encoding='utf-8')
+        self.cache_file = self.tmp / '.press-cache.json'
+
+    def write_csv(self, urls):
+        csv_path = self.tmp / 'press.csv'
+        csv_path.write_text('\n'.join(urls) + '\n', encoding='utf-8')
+        return csv_path
+
+    def generate(self, csv_path, concurrency=generate_press.MAX_CONCURRENCY):
+        return generate_press.generate_press(
+            self.page, concurrency=concurrency, csv_path=csv_path,
+            cache_file=self.cache_file, verbose=False)
+
+    def test_parses_opengraph_and_cleans_title(self):
+        url = f'{self.base_url}/article/1'
+        summary = self.generate(self.write_csv([url]))
+
+        self.assertEqual(summary, {'urls': 1, 'on_page': 0, 'skipped': 0, 'cached': 0,
+                                   'fetched': 1, 'failed': 0, 'added': 1, 'injected': True})
+        meta = generate_press.load_cache(self.cache_file)[url]['meta']
+        self.assertEqual(meta['title'], 'Robotic Wheelchair Story 1 | Example News')
+        self.assertEqual(meta['site_name'], 'Example News')
+        self.assertEqual(generate_press.clean_title(meta['title'], meta['site_name']),
+                         'Robotic Wheelchair Story 1')
+
+        html = self.page.read_text(encoding='utf-8')
+        self.assertIn('>Robotic Wheelchair Story 1</h3>', html)
+        self.assertIn('>Example News</p>', html)
+        self.assertIn(generate_press.BADGE_CLASSES['News'], html)
+
+    def test_curated_cards_are_kept_and_not_fetched(self):
+        original = self.page.read_text(encoding='utf-8')
+        summary = self.generate(self.write_csv([self.curated_url]))
+
+        self.assertEqual(summary['on_page'], 1)
+        self.assertEqual(summary['added'], 0)
+        self.assertEqual(PressHandler.requests, 0)
+        self.assertEqual(self.page.read_text(encoding='utf-8'), original)
+
+    def test_new_cards_follow_curated_ones(self):
+        self.generate(self.write_csv([f'{self.base_url}/article/2', self.curated_url]))
+
+        html = self.page.read_text(encoding='utf-8')
+        self.assertIn('Hand-Written Title', html)
+        self.assertLess(html.index('Hand-Written Title'), html.index('Robotic Wheelchair Story 2'))
+        self.assertEqual([url for url, _ in generate_press.read_existing_cards(self.page)],
+                         [self.curated_url, f'{self.base_url}/article/2'])
+
+    def test_non_article_hosts_are_skipped(self):
+        urls = ['https://www.linkedin.com/company/example/posts/?feedView=all',
+                'https://mailchi.mp/example/newsletter',
+                'https://www.kxan.com/business/press-releases/cision/example/']
+        summary = self.generate(self.write_csv(urls))
+
+        self.assertEqual(summary['skipped'], 3)
+        self.assertEqual(summary['added'], 0)
+        self.assertFalse(self.cache_file.exists())
+
+    def test_concurrency_is_capped(self):
+        urls = [f'{self.base_url}/article/{n}' for n in range(12)]
+        summary = self.generate(self.write_csv(urls), concurrency=3)
+
+        self.assertEqual(summary['fetched'], 12)
+        self.assertEqual(PressHandler.requests, 12)
+        self.assertLessEqual(PressHandler.max_in_flight, 3)
+        self.assertGreater(PressHandler.max_in_flight, 1)
+
+    def test_second_run_uses_cache(self):
+        csv_path = self.write_csv([f'{self.base_url}/article/{n}' for n in range(4)])
+        original = self.page.read_text(encoding='utf-8')
+        self.generate(csv_path)
+        first_html = self.page.read_text(encoding='utf-8')
+        PressHandler.requests = 0
+        self.page.write_text(original, encoding='utf-8')  # Each deploy starts from the source page
+
+        summary = self.generate(csv_path)
+
+        self.assertEqual((summary['cached'], summary['fetched'], summary['added']), (4, 0, 4))
+        self.assertEqual(PressHandler.requests, 0)
+        self.assertEqual(self.page.read_text(encoding='utf-8'), first_html)
+
+    def test_offline_without_cache_adds_nothing(self):
+        original = self.page.read_text(encoding='utf-8')
+        summary = generate_press.generate_press(
+            self.page, offline=True, csv_path=self.write_csv([f'{self.base_url}/article/3']),
+            cache_file=self.cache_file, verbose=False)
+
+        self.assertEqual((summary['cached'], summary['fetched'], summary['failed']), (0, 0, 1))
+        self.assertEqual(PressHandler.requests, 0)
+        self.assertEqual(self.page.read_text(encoding='utf-8'), original)
+
+    def test_failing_urls_are_left_out(self):
+        failing = [
+            f'{self.base_url}/error',
+            f'{self.base_url}/garbage',
+            f'http://127.0.0.1:{unused_port()}/unreachable',
+        ]
+        bogus = f'{self.base_url}/bogus-charset'
+        summary = self.generate(self.write_csv(failing + [bogus]))
+
+        self.assertEqual((summary['failed'], summary['added']), (len(failing), 1))
+        cache = generate_press.load_cache(self.cache_file)
+        for url in failing:
+            self.assertIn('error', cache[url])
+        html = self.page.read_text(encoding='utf-8')
+        self.assertIn('Hand-Written Title', html)
+        self.assertNotIn('>127.0.0.1</h3>', html)
+
+        # An unknown charset is decoded as UTF-8 rather than failing the fetch
+        self.assertEqual(cache[bogus]['meta']['site_name'], 'Example News')
+
+
+if __name__ == '__main__':
+    unittest.main()